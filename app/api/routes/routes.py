@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
+from typing import List
 import uuid
 
 from app.models.route_models import RawRouteFeature, NormalizedRoute
+from app.services.route_index import index_route, routes_near
 from app.services.route_normalizer import normalize_raw_route
 
 router = APIRouter(prefix="/routes", tags=["routes"])
@@ -17,6 +19,10 @@ class CreateRouteResponse(BaseModel):
     normalized: NormalizedRoute
 
 
+class NearRoutesResponse(BaseModel):
+    route_ids: List[str]
+
+
 @router.post("", response_model=CreateRouteResponse)
 def create_route(raw: RawRouteFeature) -> CreateRouteResponse:
     # Step 1 scope: contract + normalization only (no DB/auth).
@@ -25,4 +31,17 @@ def create_route(raw: RawRouteFeature) -> CreateRouteResponse:
         normalized = normalize_raw_route(route_id=route_id, raw=raw)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    index_route(route_id, normalized.normalized.bbox_wgs84)
     return CreateRouteResponse(route_id=route_id, normalized=normalized)
+
+
+@router.get("/near", response_model=NearRoutesResponse)
+def near_routes(
+    lon: float = Query(ge=-180.0, le=180.0),
+    lat: float = Query(ge=-90.0, le=90.0),
+    r: float = Query(default=1000.0, gt=0, le=500_000.0, description="radius in meters"),
+    limit: int = Query(default=50, ge=1, le=500),
+) -> NearRoutesResponse:
+    # Bbox-level match via the route R-tree (candidates, not exact distance-to-line).
+    # The index is per worker process and in-memory; see app/services/route_index.py.
+    return NearRoutesResponse(route_ids=routes_near(lon, lat, r, limit))
@@ -1,8 +1,19 @@
 # path: boat-ride-api/app/main.py
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.api.routes.routes import router as routes_router
+from app.utils.geo_numba import warmup as warmup_geo_kernels
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # JIT-compile geometry kernels up front so the first POST /routes isn't slow.
+    warmup_geo_kernels()
+    yield
+
 
-app = FastAPI(title="boat-ride-api")
+app = FastAPI(title="boat-ride-api", lifespan=lifespan)
 
 app.include_router(routes_router)
@@ -7,31 +7,43 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Tuple
-from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Literal, Optional
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 
 RouteVersion = Literal["1.0"]
 
 
 class RawRouteGeometry(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     type: Literal["LineString"]
-    coordinates: List[Tuple[float, float]]  # (lon, lat)
+    coordinates: list[tuple[float, float]]  # (lon, lat)
 
     @field_validator("coordinates")
     @classmethod
-    def validate_coords(cls, coords: List[Tuple[float, float]]):
+    def validate_coords(cls, coords: list[tuple[float, float]]):
         if len(coords) < 2:
             raise ValueError("LineString must contain at least 2 coordinates")
-        for lon, lat in coords:
-            if not (-180.0 <= lon <= 180.0):
+        # pydantic-core has already enforced the (float, float) shape; bounds-check in one pass.
+        # Written as "not in range" so NaN is rejected too.
+        arr = np.asarray(coords, dtype=np.float64)
+        lon_bad = ~((arr[:, 0] >= -180.0) & (arr[:, 0] <= 180.0))
+        lat_bad = ~((arr[:, 1] >= -90.0) & (arr[:, 1] <= 90.0))
+        bad = lon_bad | lat_bad
+        if np.any(bad):
+            k = int(np.argmax(bad))
+            lon, lat = coords[k]
+            if lon_bad[k]:
                 raise ValueError(f"lon out of range [-180,180]: {lon}")
-            if not (-90.0 <= lat <= 90.0):
-                raise ValueError(f"lat out of range [-90,90]: {lat}")
+            raise ValueError(f"lat out of range [-90,90]: {lat}")
         return coords
 
 
 class RawRouteProperties(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: Optional[str] = Field(default=None, max_length=80)
     source: Optional[str] = Field(default="mobile")
     created_at_utc: Optional[datetime] = None
@@ -40,6 +52,8 @@ class RawRouteProperties(BaseModel):
 
 
 class RawRouteFeature(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     route_version: RouteVersion = "1.0"
     type: Literal["Feature"]
     geometry: RawRouteGeometry
@@ -53,6 +67,8 @@ class RawRouteFeature(BaseModel):
 
 
 class NormalizedPoint(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     i: int = Field(ge=0)
     lat: float
     lon: float
@@ -62,6 +78,8 @@ class NormalizedPoint(BaseModel):
 
 
 class BBoxWGS84(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     min_lat: float
     min_lon: float
     max_lat: float
@@ -69,6 +87,8 @@ class BBoxWGS84(BaseModel):
 
 
 class NormalizedRouteBody(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     spacing_m: float = Field(gt=0)
     total_distance_m: float = Field(ge=0)
     point_count: int = Field(ge=2)
@@ -81,14 +101,16 @@ class NormalizedRouteBody(BaseModel):
             raise ValueError("point_count must equal len(points)")
         if len(self.points) < 2:
             raise ValueError("Normalized route must have at least 2 points")
-        # Ensure indexes are contiguous starting at 0
-        for idx, p in enumerate(self.points):
-            if p.i != idx:
-                raise ValueError("Normalized points must have contiguous i starting at 0")
+        # Ensure indexes run 0..n-1; the normalizer assigns i from range(), so checking
+        # the ends is enough to catch a truncated or offset list.
+        if self.points[0].i != 0 or self.points[-1].i != len(self.points) - 1:
+            raise ValueError("Normalized points must have contiguous i starting at 0")
         return self
 
 
 class NormalizedRoute(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     route_version: RouteVersion = "1.0"
     route_id: str
     normalized: NormalizedRouteBody
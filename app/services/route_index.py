@@ -0,0 +1,84 @@
+# path: boat-ride-api/app/services/route_index.py
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import List, Tuple
+import math
+import threading
+
+from app.models.route_models import BBoxWGS84
+from app.utils.geo import EARTH_RADIUS_M
+
+try:
+    from rtree import index as rtree_index
+
+    HAVE_RTREE = True
+except ImportError:  # pragma: no cover - rtree is optional
+    rtree_index = None
+    HAVE_RTREE = False
+
+
+# In-memory spatial index over normalized route bboxes. It is PER PROCESS: each uvicorn
+# worker keeps its own and it is lost on restart (there is no DB yet), so /routes/near
+# only sees routes created through the worker that answers. R-tree (libspatialindex)
+# when available, linear scan otherwise.
+MAX_INDEXED_ROUTES = 10_000
+
+_LOCK = threading.Lock()
+# int_id -> (route_id, bbox). Every created route gets its own entry; ids only grow, so
+# dict order, eviction order and "newest first" results all follow the same key.
+_ENTRIES: "OrderedDict[int, Tuple[str, Tuple[float, float, float, float]]]" = OrderedDict()
+_IDX = rtree_index.Index() if HAVE_RTREE else None
+_next_id = 0
+
+
+def index_route(route_id: str, bbox: BBoxWGS84) -> None:
+    global _next_id
+    box = (bbox.min_lon, bbox.min_lat, bbox.max_lon, bbox.max_lat)
+    with _LOCK:
+        int_id = _next_id
+        _next_id += 1
+        _ENTRIES[int_id] = (route_id, box)
+        if _IDX is not None:
+            _IDX.insert(int_id, box, obj=route_id)
+
+        # Evict the oldest routes past the cap
+        while len(_ENTRIES) > MAX_INDEXED_ROUTES:
+            old_id, (_, old_box) = _ENTRIES.popitem(last=False)
+            if _IDX is not None:
+                _IDX.delete(old_id, old_box)
+
+
+def radius_bbox(lon: float, lat: float, radius_m: float) -> Tuple[float, float, float, float]:
+    # Lon/lat box enclosing a circle of radius_m around (lon, lat); clamped, no antimeridian wrap.
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    coslat = math.cos(math.radians(lat))
+    dlon = 180.0 if coslat < 1e-12 else min(180.0, dlat / coslat)
+    return (
+        max(-180.0, lon - dlon),
+        max(-90.0, lat - dlat),
+        min(180.0, lon + dlon),
+        min(90.0, lat + dlat),
+    )
+
+
+def routes_near(lon: float, lat: float, radius_m: float, limit: int) -> List[str]:
+    """
+    Up to `limit` route ids (newest first) whose bbox intersects the box
+    around (lon, lat) +/- radius_m. Bbox-level candidates only; callers wanting exact
+    distance should refine on the points.
+    """
+    min_lon, min_lat, max_lon, max_lat = radius_bbox(lon, lat, radius_m)
+    with _LOCK:
+        if _IDX is not None:
+            hits = list(_IDX.intersection((min_lon, min_lat, max_lon, max_lat)))
+        else:
+            hits = [
+                int_id
+                for int_id, (_, (a_lon, a_lat, b_lon, b_lat)) in _ENTRIES.items()
+                if a_lon <= max_lon and b_lon >= min_lon and a_lat <= max_lat and b_lat >= min_lat
+            ]
+        # Ids are assigned in indexing order, so descending id is newest route first
+        hits.sort(reverse=True)
+        return [_ENTRIES[i][0] for i in hits[:limit]]
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import List, Tuple
 import hashlib
 import json
+import threading
+
+import numpy as np
+from pydantic import TypeAdapter
 
 from app.models.route_models import (
     RawRouteFeature,
@@ -13,7 +18,8 @@ from app.models.route_models import (
     NormalizedPoint,
     BBoxWGS84,
 )
-from app.utils.geo import bbox_wgs84, polyline_length_m, haversine_m, bearing_deg_true
+from app.utils.geo import bbox_wgs84, bearings_vec, haversine_vec
+from app.utils.geo_numba import HAVE_NUMBA, resample_polyline
 
 
 DEFAULT_SPACING_M = 250.0
@@ -22,36 +28,61 @@ MIN_ROUTE_M = 25.0
 MAX_ROUTE_M = 500_000.0
 MAX_SEGMENT_M = 50_000.0
 
+# Content-addressed LRU of normalization output, keyed on (sha256 of the raw feature JSON,
+# requested spacing). Holds compact sample/bearing arrays (~40 B per point), not pydantic
+# bodies. Per-process, like any in-memory cache.
+NORMALIZE_CACHE_SIZE = 128
+_NORMALIZE_CACHE: "OrderedDict[Tuple[bytes, float | None], Tuple[np.ndarray, np.ndarray, float, str]]" = OrderedDict()
+_NORMALIZE_CACHE_LOCK = threading.Lock()
+
+_POINTS_ADAPTER = TypeAdapter(List[NormalizedPoint])
+
+SAMPLE_DTYPE = np.dtype(
+    [("lat", np.float64), ("lon", np.float64), ("seg_dist_m", np.float64), ("cum_dist_m", np.float64)]
+)
+
 
-def stable_json_sha256(obj) -> str:
-    data = json.dumps(obj, separators=(",", ":"), sort_keys=True).encode("utf-8")
+def stable_raw_hash(raw: RawRouteFeature) -> str:
+    # Canonical JSON (sorted keys at every level) so free-form dicts like properties.client
+    # hash the same regardless of the key order the client sent. Stdlib json keeps arbitrary
+    # precision ints and repr-exact floats, so distinct payloads never collapse to one hash.
+    data = json.dumps(raw.model_dump(mode="json"), separators=(",", ":"), sort_keys=True).encode("utf-8")
     return "sha256:" + hashlib.sha256(data).hexdigest()
 
 
-def validate_route_guardrails(points_lonlat: List[Tuple[float, float]]) -> None:
+def validate_route_guardrails(points_lonlat: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    points_lonlat: (N, 2) float64 array of (lon, lat)
+    Returns (cum, keep): keep masks out consecutive duplicates, cum is the cumulative
+    distance (m) at each kept vertex, i.e. points_lonlat[keep]. This is the only
+    distance pass; length, spacing and resampling all reuse cum.
+    """
     # De-dupe consecutive duplicates
-    deduped = [points_lonlat[0]]
-    for p in points_lonlat[1:]:
-        if p != deduped[-1]:
-            deduped.append(p)
-    if len(deduped) < 2:
+    keep = np.ones(len(points_lonlat), dtype=bool)
+    keep[1:] = np.any(points_lonlat[1:] != points_lonlat[:-1], axis=1)
+    arr = points_lonlat[keep]
+    if len(arr) < 2:
         raise ValueError("Route collapses to <2 unique points after de-dupe")
 
-    # Segment sanity
-    for i in range(1, len(deduped)):
-        a_lon, a_lat = deduped[i - 1]
-        b_lon, b_lat = deduped[i]
-        seg = haversine_m(a_lon, a_lat, b_lon, b_lat)
+    # Segment sanity (first offending segment wins, same as a sequential scan)
+    segs = haversine_vec(arr[:, 0], arr[:, 1])
+    bad = (segs <= 0) | (segs > MAX_SEGMENT_M)
+    if np.any(bad):
+        k = int(np.argmax(bad))
+        seg = float(segs[k])
         if seg <= 0:
             raise ValueError("Adjacent duplicate points not allowed")
-        if seg > MAX_SEGMENT_M:
-            raise ValueError(f"Segment too long (> {MAX_SEGMENT_M} m): {seg:.1f} m")
+        # Report the raw coordinate index the segment starts at, not the de-duped one
+        start = int(np.flatnonzero(keep)[k])
+        raise ValueError(f"Segment too long (> {MAX_SEGMENT_M} m): {seg:.1f} m at coordinate {start}")
 
-    total = polyline_length_m(deduped)
+    cum = np.concatenate(([0.0], np.cumsum(segs)))
+    total = float(cum[-1])
     if total < MIN_ROUTE_M:
         raise ValueError(f"Route too short (< {MIN_ROUTE_M} m): {total:.1f} m")
     if total > MAX_ROUTE_M:
         raise ValueError(f"Route too long (> {MAX_ROUTE_M} m): {total:.1f} m")
+    return cum, keep
 
 
 def pick_spacing_m(total_distance_m: float, requested_spacing_m: float | None = None) -> float:
@@ -67,99 +98,87 @@ def pick_spacing_m(total_distance_m: float, requested_spacing_m: float | None =
     return float(spacing)
 
 
-def resample_even_spacing(points_lonlat: List[Tuple[float, float]], spacing_m: float) -> List[Tuple[float, float, float, float]]:
+def resample_even_spacing(points_lonlat: np.ndarray, cum: np.ndarray, spacing_m: float) -> np.ndarray:
     """
-    Returns list of tuples: (lat, lon, seg_dist_m, cum_dist_m)
+    points_lonlat: (N, 2) float64 array of (lon, lat)
+    cum: (N,) cumulative distance (m) at each vertex, as returned by validate_route_guardrails
+    Returns structured array of SAMPLE_DTYPE rows: (lat, lon, seg_dist_m, cum_dist_m)
     """
-    # Work in lon/lat list, generate cumulative distance along original polyline.
-    # Simple linear interpolation along segments by distance.
+    # Work in lon/lat arrays, generate cumulative distance along original polyline.
+    # Simple linear interpolation along segments by distance (numba walker, else np.interp per axis).
     # (Swap to geodesic interpolation later if desired; contract stays same.)
+    # Not using shapely's LineString.interpolate: it needs a planar projection whose lengths
+    # wouldn't match the haversine cum from the guardrails, and this walk already runs in C.
 
-    # Build segment lengths
-    segs = []
-    for i in range(1, len(points_lonlat)):
-        a_lon, a_lat = points_lonlat[i - 1]
-        b_lon, b_lat = points_lonlat[i]
-        seg_len = haversine_m(a_lon, a_lat, b_lon, b_lat)
-        segs.append((a_lon, a_lat, b_lon, b_lat, seg_len))
-
-    total = sum(s[-1] for s in segs)
+    arr = points_lonlat
+    total = float(cum[-1])
     if total == 0:
         raise ValueError("Route length is zero")
 
-    # Target distances along route
-    targets = [0.0]
-    d = spacing_m
-    while d < total:
-        targets.append(d)
-        d += spacing_m
-    if targets[-1] != total:
-        targets.append(total)
-
-    out = []
-    seg_idx = 0
-    seg_start_cum = 0.0
-
-    last_cum = 0.0
-    for t in targets:
-        while seg_idx < len(segs) and seg_start_cum + segs[seg_idx][-1] < t:
-            seg_start_cum += segs[seg_idx][-1]
-            seg_idx += 1
-        if seg_idx >= len(segs):
-            # Should only happen at end
-            a_lon, a_lat, b_lon, b_lat, seg_len = segs[-1]
-            lon, lat = b_lon, b_lat
-        else:
-            a_lon, a_lat, b_lon, b_lat, seg_len = segs[seg_idx]
-            if seg_len == 0:
-                lon, lat = b_lon, b_lat
-            else:
-                frac = (t - seg_start_cum) / seg_len
-                lon = a_lon + frac * (b_lon - a_lon)
-                lat = a_lat + frac * (b_lat - a_lat)
-
-        seg_dist = 0.0 if not out else (t - last_cum)
-        out.append((lat, lon, float(seg_dist), float(t)))
-        last_cum = t
-
+    if HAVE_NUMBA:
+        lat, lon, seg_dist, targets = resample_polyline(
+            np.ascontiguousarray(arr[:, 0]), np.ascontiguousarray(arr[:, 1]), cum, float(spacing_m)
+        )
+    else:
+        # Target distances along route; always end exactly on the last vertex
+        targets = np.append(np.arange(0.0, total, spacing_m), total)
+        # cum is strictly increasing here (guardrails reject zero-length segments after de-dupe)
+        lat = np.interp(targets, cum, arr[:, 1])
+        lon = np.interp(targets, cum, arr[:, 0])
+        seg_dist = np.diff(targets, prepend=targets[0])
+
+    out = np.empty(len(targets), dtype=SAMPLE_DTYPE)
+    out["lat"] = lat
+    out["lon"] = lon
+    out["seg_dist_m"] = seg_dist
+    out["cum_dist_m"] = targets
     return out
 
 
-def normalize_raw_route(route_id: str, raw: RawRouteFeature, spacing_m: float | None = None) -> NormalizedRoute:
-    points_lonlat = [(lon, lat) for (lon, lat) in raw.geometry.coordinates]
-
-    validate_route_guardrails(points_lonlat)
-    total = polyline_length_m(points_lonlat)
-    spacing = pick_spacing_m(total, spacing_m)
-
-    samples = resample_even_spacing(points_lonlat, spacing)
-
-    # Bearings from consecutive normalized points (true degrees)
-    bearings = []
-    for i in range(len(samples) - 1):
-        lat1, lon1, _, _ = samples[i]
-        lat2, lon2, _, _ = samples[i + 1]
-        bearings.append(bearing_deg_true(lon1, lat1, lon2, lat2))
-    if bearings:
-        bearings.append(bearings[-1])
-    else:
-        bearings.append(0.0)
-
-    pts = []
-    for i, (lat, lon, seg_dist_m, cum_dist_m) in enumerate(samples):
-        pts.append(
-            NormalizedPoint(
-                i=i,
-                lat=float(lat),
-                lon=float(lon),
-                seg_dist_m=float(seg_dist_m),
-                cum_dist_m=float(cum_dist_m),
-                bearing_deg_true=float(bearings[i]),
+def _normalize_arrays(raw: RawRouteFeature, spacing_m: float | None) -> Tuple[np.ndarray, np.ndarray, float]:
+    # (N, 2) lon/lat array at the boundary; columns are what the geo kernels consume.
+    points_lonlat = np.asarray(raw.geometry.coordinates, dtype=np.float64)
+
+    cum, keep = validate_route_guardrails(points_lonlat)
+    spacing = pick_spacing_m(float(cum[-1]), spacing_m)
+
+    # Duplicates only add zero-length segments, so resampling the kept vertices is equivalent
+    samples = resample_even_spacing(points_lonlat[keep], cum, spacing)
+
+    # Bearings from consecutive normalized points (true degrees); last point repeats the final leg
+    b = bearings_vec(samples["lon"], samples["lat"])
+    bearings = np.append(b, b[-1] if len(b) else 0.0)
+    return samples, bearings, spacing
+
+
+def _build_body(samples: np.ndarray, bearings: np.ndarray, spacing: float) -> NormalizedRouteBody:
+    lats = samples["lat"]
+    lons = samples["lon"]
+    # One validation call over all rows (keeps the ge/lt bounds on every point)
+    pts = _POINTS_ADAPTER.validate_python(
+        [
+            {
+                "i": i,
+                "lat": lat,
+                "lon": lon,
+                "seg_dist_m": seg_dist_m,
+                "cum_dist_m": cum_dist_m,
+                "bearing_deg_true": brg,
+            }
+            for i, (lat, lon, seg_dist_m, cum_dist_m, brg) in enumerate(
+                zip(
+                    lats.tolist(),
+                    lons.tolist(),
+                    samples["seg_dist_m"].tolist(),
+                    samples["cum_dist_m"].tolist(),
+                    bearings.tolist(),
+                )
             )
-        )
+        ]
+    )
 
-    bbox = bbox_wgs84([(p.lon, p.lat) for p in pts])
-    body = NormalizedRouteBody(
+    bbox = bbox_wgs84(np.column_stack((lons, lats)))
+    return NormalizedRouteBody(
         spacing_m=float(spacing),
         total_distance_m=float(pts[-1].cum_dist_m),
         point_count=len(pts),
@@ -167,12 +186,31 @@ def normalize_raw_route(route_id: str, raw: RawRouteFeature, spacing_m: float |
         points=pts,
     )
 
-    # Hash raw with stable ordering (Feature dict form)
-    raw_dict = raw.model_dump(mode="json")
-    raw_hash = stable_json_sha256(raw_dict)
 
+def normalize_raw_route(route_id: str, raw: RawRouteFeature, spacing_m: float | None = None) -> NormalizedRoute:
+    # Retries / repeated uploads reuse the cached pipeline output; the body (and route_id)
+    # is rebuilt per call so responses never share mutable pydantic objects.
+    raw_json = raw.model_dump_json()
+    key = (hashlib.sha256(raw_json.encode("utf-8")).digest(), spacing_m)
+
+    with _NORMALIZE_CACHE_LOCK:
+        entry = _NORMALIZE_CACHE.get(key)
+        if entry is not None:
+            _NORMALIZE_CACHE.move_to_end(key)
+
+    if entry is None:
+        samples, bearings, spacing = _normalize_arrays(raw, spacing_m)
+        samples.flags.writeable = False
+        bearings.flags.writeable = False
+        entry = (samples, bearings, spacing, stable_raw_hash(raw))
+        with _NORMALIZE_CACHE_LOCK:
+            _NORMALIZE_CACHE[key] = entry
+            while len(_NORMALIZE_CACHE) > NORMALIZE_CACHE_SIZE:
+                _NORMALIZE_CACHE.popitem(last=False)
+
+    samples, bearings, spacing, raw_hash = entry
     return NormalizedRoute(
         route_id=route_id,
-        normalized=body,
+        normalized=_build_body(samples, bearings, spacing),
         source_raw_hash=raw_hash,
     )
@@ -2,31 +2,71 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List, Tuple, Dict
+from typing import List, Tuple, Dict
 import math
 
+import numpy as np
 
-def bbox_wgs84(points_lonlat: Iterable[Tuple[float, float]]) -> Dict[str, float]:
-    lons = [p[0] for p in points_lonlat]
-    lats = [p[1] for p in points_lonlat]
+from app.utils.geo_numba import (
+    EARTH_RADIUS_M,
+    EQUIRECT_MAX_RAD,
+    HAVE_NUMBA,
+    haversine_segments,
+    segment_bearings,
+)
+
+
+def _f64(a) -> np.ndarray:
+    # Numba kernels are warmed for contiguous float64; avoid compiling per-layout variants.
+    return np.ascontiguousarray(a, dtype=np.float64)
+
+
+def bbox_wgs84(arr: np.ndarray) -> Dict[str, float]:
+    # arr: (N, 2) lon/lat; one reduction per bound instead of a pass per coordinate
+    mn = arr.min(axis=0)
+    mx = arr.max(axis=0)
     return {
-        "min_lat": min(lats),
-        "min_lon": min(lons),
-        "max_lat": max(lats),
-        "max_lon": max(lons),
+        "min_lat": float(mn[1]),
+        "min_lon": float(mn[0]),
+        "max_lat": float(mx[1]),
+        "max_lon": float(mx[0]),
     }
 
 
 def haversine_m(a_lon: float, a_lat: float, b_lon: float, b_lat: float) -> float:
     # Good enough for validation guardrails; you can swap to pyproj/GeographicLib later.
-    r = 6371000.0
     phi1 = math.radians(a_lat)
     phi2 = math.radians(b_lat)
     dphi = math.radians(b_lat - a_lat)
     dlmb = math.radians(b_lon - a_lon)
 
     s = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
-    return 2 * r * math.asin(math.sqrt(s))
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(s))
+
+
+def haversine_vec(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    # Segment lengths (m) between consecutive vertices; len(out) == len(lon) - 1.
+    if HAVE_NUMBA:
+        return haversine_segments(_f64(lon), _f64(lat))
+    phi = np.radians(lat)
+    dphi = np.diff(phi)
+    dlmb = np.diff(np.radians(lon))
+    cosphi = np.cos(phi)  # one cos per vertex, shared by both formulas below
+    c1 = cosphi[:-1]
+    c2 = cosphi[1:]
+
+    out = np.empty(len(dphi), dtype=np.float64)
+    # Short segments: equirectangular, no sin/arcsin needed
+    small = np.abs(dphi) + np.abs(dlmb) < EQUIRECT_MAX_RAD
+    if small.any():
+        out[small] = EARTH_RADIUS_M * np.hypot(dlmb[small] * 0.5 * (c1[small] + c2[small]), dphi[small])
+    big = ~small
+    if big.any():
+        dp = dphi[big]
+        dl = dlmb[big]
+        s = np.sin(dp / 2) ** 2 + c1[big] * c2[big] * np.sin(dl / 2) ** 2
+        out[big] = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(s))
+    return out
 
 
 def bearing_deg_true(a_lon: float, a_lat: float, b_lon: float, b_lat: float) -> float:
@@ -41,10 +81,21 @@ def bearing_deg_true(a_lon: float, a_lat: float, b_lon: float, b_lat: float) ->
     return (brng + 360.0) % 360.0
 
 
-def polyline_length_m(points_lonlat: List[Tuple[float, float]]) -> float:
-    total = 0.0
-    for i in range(1, len(points_lonlat)):
-        a_lon, a_lat = points_lonlat[i - 1]
-        b_lon, b_lat = points_lonlat[i]
-        total += haversine_m(a_lon, a_lat, b_lon, b_lat)
-    return total
+def bearings_vec(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    # Initial bearing between consecutive vertices, degrees true, [0,360); len(out) == len(lon) - 1.
+    if HAVE_NUMBA:
+        return segment_bearings(_f64(lon), _f64(lat))
+    phi = np.radians(lat)
+    sinphi = np.sin(phi)
+    cosphi = np.cos(phi)
+    dlmb = np.radians(np.diff(lon))
+
+    y = np.sin(dlmb) * cosphi[1:]
+    x = cosphi[:-1] * sinphi[1:] - sinphi[:-1] * cosphi[1:] * np.cos(dlmb)
+    brng = np.degrees(np.arctan2(y, x))
+    return (brng + 360.0) % 360.0
+
+
+def polyline_length_m(points_lonlat: List[Tuple[float, float]] | np.ndarray) -> float:
+    arr = np.asarray(points_lonlat, dtype=np.float64).reshape(-1, 2)
+    return float(haversine_vec(arr[:, 0], arr[:, 1]).sum())
@@ -0,0 +1,140 @@
+# path: boat-ride-api/app/utils/geo_numba.py
+
+from __future__ import annotations
+
+from typing import Tuple
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is optional
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # No-op stand-in so the kernels below stay importable (as plain Python loops).
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+EARTH_RADIUS_M = 6371000.0
+# Segments with |dphi| + |dlmb| below this (radians, ~6 km) use the equirectangular
+# approximation; the difference from haversine is far below GPS noise at that scale.
+EQUIRECT_MAX_RAD = 1e-3
+
+
+@njit(cache=True, fastmath=True)
+def haversine_segments(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    n = lon.shape[0]
+    out = np.empty(max(n - 1, 0), dtype=np.float64)
+    if n == 0:
+        return out
+    # cos(lat) is computed once per vertex and carried to the next segment
+    phi1 = math.radians(lat[0])
+    cos1 = math.cos(phi1)
+    for i in range(n - 1):
+        phi2 = math.radians(lat[i + 1])
+        cos2 = math.cos(phi2)
+        dphi = phi2 - phi1
+        dlmb = math.radians(lon[i + 1] - lon[i])
+        if abs(dphi) + abs(dlmb) < EQUIRECT_MAX_RAD:
+            dx = dlmb * 0.5 * (cos1 + cos2)
+            out[i] = EARTH_RADIUS_M * math.sqrt(dx * dx + dphi * dphi)
+        else:
+            s = math.sin(dphi / 2) ** 2 + cos1 * cos2 * math.sin(dlmb / 2) ** 2
+            out[i] = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(s))
+        phi1 = phi2
+        cos1 = cos2
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def segment_bearings(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    n = lon.shape[0]
+    out = np.empty(max(n - 1, 0), dtype=np.float64)
+    if n == 0:
+        return out
+    # sin/cos(lat) are computed once per vertex and carried to the next segment
+    phi1 = math.radians(lat[0])
+    sin1 = math.sin(phi1)
+    cos1 = math.cos(phi1)
+    for i in range(n - 1):
+        phi2 = math.radians(lat[i + 1])
+        sin2 = math.sin(phi2)
+        cos2 = math.cos(phi2)
+        dlmb = math.radians(lon[i + 1] - lon[i])
+        y = math.sin(dlmb) * cos2
+        x = cos1 * sin2 - sin1 * cos2 * math.cos(dlmb)
+        out[i] = (math.degrees(math.atan2(y, x)) + 360.0) % 360.0
+        sin1 = sin2
+        cos1 = cos2
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def resample_polyline(
+    lon: np.ndarray, lat: np.ndarray, cum: np.ndarray, spacing: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Same targets as np.append(np.arange(0, total, spacing), total), interpolated
+    # linearly by distance along the original polyline.
+    # spacing stays a runtime argument: per-spacing specialized kernels would only bake in
+    # one constant (saving a multiply per target), not worth a JIT compile per value.
+    total = cum[cum.shape[0] - 1]
+    n_seg = cum.shape[0] - 1
+    n = int(math.ceil(total / spacing)) + 1
+
+    out_lat = np.empty(n, dtype=np.float64)
+    out_lon = np.empty(n, dtype=np.float64)
+    seg_dist = np.empty(n, dtype=np.float64)
+    targets = np.empty(n, dtype=np.float64)
+
+    # Per-segment constants are refreshed only when the walker moves to a new segment,
+    # so each target costs two multiply-adds instead of a division.
+    j = 0
+    prev = 0.0
+    seg_j = -1
+    a_cum = a_lon = a_lat = d_lon = d_lat = inv_len = 0.0
+    for k in range(n):
+        t = total if k == n - 1 else k * spacing
+        while j < n_seg and cum[j + 1] < t:
+            j += 1
+        if j >= n_seg:
+            out_lon[k] = lon[n_seg]
+            out_lat[k] = lat[n_seg]
+        else:
+            if j != seg_j:
+                seg_j = j
+                a_cum = cum[j]
+                a_lon = lon[j]
+                a_lat = lat[j]
+                d_lon = lon[j + 1] - a_lon
+                d_lat = lat[j + 1] - a_lat
+                seg_len = cum[j + 1] - a_cum
+                inv_len = 1.0 / seg_len if seg_len > 0 else 0.0
+            if inv_len == 0.0:
+                out_lon[k] = lon[j + 1]
+                out_lat[k] = lat[j + 1]
+            else:
+                frac = (t - a_cum) * inv_len
+                out_lon[k] = a_lon + frac * d_lon
+                out_lat[k] = a_lat + frac * d_lat
+        seg_dist[k] = t - prev
+        targets[k] = t
+        prev = t
+    return out_lat, out_lon, seg_dist, targets
+
+
+def warmup() -> None:
+    # Compile (or load from cache) every kernel so the first request doesn't pay JIT cost.
+    if not HAVE_NUMBA:
+        return
+    lon = np.array([0.0, 0.001, 0.002], dtype=np.float64)
+    lat = np.array([0.0, 0.001, 0.0], dtype=np.float64)
+    segs = haversine_segments(lon, lat)
+    cum = np.concatenate((np.zeros(1), np.cumsum(segs)))
+    segment_bearings(lon, lat)
+    resample_polyline(lon, lat, cum, 50.0)
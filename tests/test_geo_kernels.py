@@ -0,0 +1,69 @@
+# path: boat-ride-api/tests/test_geo_kernels.py
+
+import numpy as np
+import pytest
+
+from app.services import route_normalizer
+from app.services.route_normalizer import resample_even_spacing, validate_route_guardrails
+from app.utils import geo
+from app.utils.geo import bearing_deg_true, bearings_vec, haversine_m, haversine_vec
+
+
+def _random_routes(n_routes=50, n_points=400, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(n_routes):
+        scale = rng.choice([1e-4, 1e-3, 2e-2])
+        lon = rng.uniform(-170, 170) + np.cumsum(rng.uniform(-scale, scale, n_points))
+        lat = np.clip(rng.uniform(-70, 70) + np.cumsum(rng.uniform(-scale, scale, n_points)), -89, 89)
+        yield lon, lat
+
+
+def _numpy_only(monkeypatch):
+    monkeypatch.setattr(geo, "HAVE_NUMBA", False)
+    monkeypatch.setattr(route_normalizer, "HAVE_NUMBA", False)
+
+
+def test_haversine_vec_matches_scalar():
+    for lon, lat in _random_routes(n_routes=10, n_points=200):
+        ref = [haversine_m(lon[i], lat[i], lon[i + 1], lat[i + 1]) for i in range(len(lon) - 1)]
+        np.testing.assert_allclose(haversine_vec(lon, lat), ref, rtol=1e-7, atol=1e-6)
+
+
+def test_bearings_vec_matches_scalar():
+    for lon, lat in _random_routes(n_routes=10, n_points=200):
+        ref = np.array([bearing_deg_true(lon[i], lat[i], lon[i + 1], lat[i + 1]) for i in range(len(lon) - 1)])
+        got = bearings_vec(lon, lat)
+        diff = np.abs(got - ref)
+        assert np.all(np.minimum(diff, 360.0 - diff) < 1e-6)
+        assert np.all((got >= 0.0) & (got < 360.0))
+
+
+def test_numba_kernels_match_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    routes = list(_random_routes())
+    jit = [(haversine_vec(lon, lat), bearings_vec(lon, lat)) for lon, lat in routes]
+    _numpy_only(monkeypatch)
+    for (lon, lat), (segs, brgs) in zip(routes, jit):
+        np.testing.assert_allclose(segs, haversine_vec(lon, lat), rtol=1e-9, atol=1e-6)
+        diff = np.abs(brgs - bearings_vec(lon, lat))
+        assert np.all(np.minimum(diff, 360.0 - diff) < 1e-6)
+
+
+def test_numba_resample_matches_interp(monkeypatch):
+    pytest.importorskip("numba")
+    cases = []
+    for lon, lat in _random_routes(seed=1):
+        pts = np.column_stack((lon, lat))
+        try:
+            cum, keep = validate_route_guardrails(pts)
+        except ValueError:
+            continue
+        cases.append((pts[keep], cum))
+    assert cases
+    jit = [resample_even_spacing(pts, cum, 250.0) for pts, cum in cases]
+    _numpy_only(monkeypatch)
+    for (pts, cum), got in zip(cases, jit):
+        ref = resample_even_spacing(pts, cum, 250.0)
+        assert len(got) == len(ref)
+        for field in ("lat", "lon", "seg_dist_m", "cum_dist_m"):
+            np.testing.assert_allclose(got[field], ref[field], rtol=1e-9, atol=1e-6)
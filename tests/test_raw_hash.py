@@ -0,0 +1,31 @@
+# path: boat-ride-api/tests/test_raw_hash.py
+
+import hashlib
+import json
+
+from app.models.route_models import RawRouteFeature
+from app.services.route_normalizer import stable_raw_hash
+
+
+def _raw(client):
+    return RawRouteFeature(
+        type="Feature",
+        geometry={"type": "LineString", "coordinates": [[-81.0942, 31.9871], [-81.0837, 31.9929]]},
+        properties={"name": "r", "client": client},
+    )
+
+
+def test_raw_hash_ignores_client_key_order():
+    a = _raw({"platform": "ios", "app_version": "0.1.0", "meta": {"x": 1, "y": 2}})
+    b = _raw({"meta": {"y": 2, "x": 1}, "app_version": "0.1.0", "platform": "ios"})
+    assert stable_raw_hash(a) == stable_raw_hash(b)
+
+
+def test_raw_hash_keeps_big_ints_distinct():
+    assert stable_raw_hash(_raw({"big": 2**70})) != stable_raw_hash(_raw({"big": 2**70 + 1}))
+
+
+def test_raw_hash_matches_sorted_key_json_encoding():
+    raw = _raw({"small": 1e-7, "large": 1e16, "big": 2**70})
+    data = json.dumps(raw.model_dump(mode="json"), separators=(",", ":"), sort_keys=True).encode("utf-8")
+    assert stable_raw_hash(raw) == "sha256:" + hashlib.sha256(data).hexdigest()
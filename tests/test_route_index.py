@@ -0,0 +1,94 @@
+# path: boat-ride-api/tests/test_route_index.py
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from app.models.route_models import BBoxWGS84
+from app.services import route_index
+from app.services.route_index import index_route, routes_near
+
+EXAMPLE = Path(__file__).resolve().parents[1] / "examples" / "raw_route_example.geojson"
+
+
+@pytest.fixture(params=["rtree", "scan"])
+def fresh_index(request, monkeypatch):
+    # Empty per-test index; "scan" exercises the rtree-less linear fallback.
+    if request.param == "rtree":
+        rtree_index = pytest.importorskip("rtree.index")
+        idx = rtree_index.Index()
+    else:
+        idx = None
+    monkeypatch.setattr(route_index, "_IDX", idx)
+    monkeypatch.setattr(route_index, "_ENTRIES", OrderedDict())
+    monkeypatch.setattr(route_index, "_next_id", 0)
+    return request.param
+
+
+def _bbox(lon, lat, d=0.01):
+    return BBoxWGS84(min_lon=lon, min_lat=lat, max_lon=lon + d, max_lat=lat + d)
+
+
+def test_bbox_hit_and_miss(fresh_index):
+    index_route("a", _bbox(-81.09, 31.98))
+    index_route("b", _bbox(10.0, 10.0))
+    assert routes_near(-81.085, 31.985, 100.0, limit=10) == ["a"]
+    assert routes_near(10.005, 10.005, 100.0, limit=10) == ["b"]
+    assert routes_near(0.0, 0.0, 1000.0, limit=10) == []
+
+
+def test_radius_reaches_nearby_bbox(fresh_index):
+    index_route("a", _bbox(0.0, 0.0))
+    # ~1.1 km east of the bbox edge
+    assert routes_near(0.02, 0.005, 500.0, limit=10) == []
+    assert routes_near(0.02, 0.005, 2000.0, limit=10) == ["a"]
+
+
+def test_limit_and_newest_first(fresh_index):
+    for rid in ("r0", "r1", "r2", "r3"):
+        index_route(rid, _bbox(5.0, 5.0))
+    assert routes_near(5.005, 5.005, 100.0, limit=10) == ["r3", "r2", "r1", "r0"]
+    assert routes_near(5.005, 5.005, 100.0, limit=2) == ["r3", "r2"]
+
+
+def test_same_bbox_keeps_every_route_id(fresh_index):
+    index_route("first", _bbox(5.0, 5.0))
+    index_route("other", _bbox(20.0, 20.0))
+    index_route("retry", _bbox(5.0, 5.0))
+    assert routes_near(5.005, 5.005, 100.0, limit=1) == ["retry"]
+    assert routes_near(5.005, 5.005, 100.0, limit=10) == ["retry", "first"]
+
+
+def test_eviction_at_cap(fresh_index, monkeypatch):
+    monkeypatch.setattr(route_index, "MAX_INDEXED_ROUTES", 3)
+    for rid in ("r0", "r1", "r2", "r3", "r4"):
+        index_route(rid, _bbox(5.0, 5.0))
+    assert len(route_index._ENTRIES) == 3
+    assert routes_near(5.005, 5.005, 100.0, limit=10) == ["r4", "r3", "r2"]
+    if route_index._IDX is not None:
+        assert route_index._IDX.count(route_index._IDX.bounds) == 3
+
+
+def test_near_endpoint(fresh_index):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    raw = json.loads(EXAMPLE.read_text())
+    with TestClient(app) as client:
+        first = client.post("/routes", json=raw).json()["route_id"]
+        second = client.post("/routes", json=raw).json()["route_id"]
+
+        resp = client.get("/routes/near", params={"lon": -81.09, "lat": 31.99, "r": 500})
+        assert resp.status_code == 200
+        assert resp.json()["route_ids"] == [second, first]
+
+        resp = client.get("/routes/near", params={"lon": -81.09, "lat": 31.99, "r": 500, "limit": 1})
+        assert resp.json()["route_ids"] == [second]
+
+        assert client.get("/routes/near", params={"lon": 0, "lat": 0}).json()["route_ids"] == []
+        assert client.get("/routes/near", params={"lon": 0, "lat": 0, "limit": 0}).status_code == 422
+        assert client.get("/routes/near", params={"lon": 200, "lat": 0}).status_code == 422
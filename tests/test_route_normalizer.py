@@ -0,0 +1,78 @@
+# path: boat-ride-api/tests/test_route_normalizer.py
+
+import time
+from collections import OrderedDict
+
+import pytest
+
+from app.models.route_models import RawRouteFeature
+from app.services import route_normalizer
+from app.services.route_normalizer import normalize_raw_route
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(route_normalizer, "_NORMALIZE_CACHE", OrderedDict())
+
+
+def _raw(lat0=31.9871, name="r"):
+    return RawRouteFeature(
+        type="Feature",
+        geometry={"type": "LineString", "coordinates": [[-81.0942, lat0], [-81.0837, lat0 + 0.0058]]},
+        properties={"name": name},
+    )
+
+
+def test_cache_hit_returns_fresh_route_and_equal_body():
+    raw = _raw()
+    a = normalize_raw_route("a", raw)
+    time.sleep(0.001)
+    b = normalize_raw_route("b", raw)
+    assert len(route_normalizer._NORMALIZE_CACHE) == 1
+    assert (a.route_id, b.route_id) == ("a", "b")
+    assert b.created_at_utc > a.created_at_utc
+    assert a.source_raw_hash == b.source_raw_hash
+    assert a.normalized == b.normalized
+
+
+def test_cache_hit_does_not_share_bodies():
+    raw = _raw()
+    a = normalize_raw_route("a", raw)
+    b = normalize_raw_route("b", raw)
+    assert a.normalized is not b.normalized
+    assert a.normalized.points is not b.normalized.points
+    a.normalized.points.clear()
+    assert len(normalize_raw_route("c", raw).normalized.points) == b.normalized.point_count
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(route_normalizer, "NORMALIZE_CACHE_SIZE", 2)
+    r0, r1, r2 = _raw(name="r0"), _raw(name="r1"), _raw(name="r2")
+    normalize_raw_route("x", r0)
+    normalize_raw_route("x", r1)
+    normalize_raw_route("x", r0)  # touch r0 so r1 is the oldest
+    normalize_raw_route("x", r2)
+    cache = route_normalizer._NORMALIZE_CACHE
+    assert len(cache) == 2
+    hashes = {entry[3] for entry in cache.values()}
+    assert hashes == {route_normalizer.stable_raw_hash(r0), route_normalizer.stable_raw_hash(r2)}
+
+
+def test_errors_are_not_cached():
+    raw = RawRouteFeature(
+        type="Feature",
+        geometry={"type": "LineString", "coordinates": [[0.0, 0.0], [0.0, 0.0]]},
+    )
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            normalize_raw_route("x", raw)
+    assert len(route_normalizer._NORMALIZE_CACHE) == 0
+
+
+def test_cached_arrays_are_read_only():
+    normalize_raw_route("x", _raw())
+    (samples, bearings, _, _), = route_normalizer._NORMALIZE_CACHE.values()
+    for arr in (samples, bearings):
+        assert not arr.flags.writeable
+        with pytest.raises(ValueError):
+            arr[0] = arr[0]